@@ -1,7 +1,8 @@
 from .handler import LoguruFeishuSink, add_feishu_sink
+from .normalizer import MessageNormalizer
 
 __version__ = "2.0.3"
 __author__ = "SeanZou"
 __email__ = "wersling@gmail.com"
 
-__all__ = ["LoguruFeishuSink", "add_feishu_sink"] 
\ No newline at end of file
+__all__ = ["LoguruFeishuSink", "add_feishu_sink", "MessageNormalizer"] 
\ No newline at end of file
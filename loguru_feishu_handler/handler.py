@@ -7,6 +7,8 @@ from typing import Optional, List, Dict, Any
 import requests
 from loguru import logger
 
+from .normalizer import MessageNormalizer
+
 
 class LoguruFeishuSink:
     """Loguru 飞书消息推送 Sink
@@ -22,7 +24,9 @@ class LoguruFeishuSink:
         filter_keys: Optional[List[str]] = None,
         simple_log_levelno: int = 30,  # WARNING级别以下使用简化格式
         simple_format: bool = True,
-        timeout: int = 10
+        timeout: int = 10,
+        normalize_message: bool = False,
+        normalize_patterns: Optional[Dict[str, str]] = None
     ):
         """初始化飞书 Sink
         
@@ -34,6 +38,9 @@ class LoguruFeishuSink:
             simple_log_levelno: 简化输出的日志级别阈值
             simple_format: 是否启用简化格式
             timeout: 请求超时时间
+            normalize_message: 是否按归一化后的消息去重，启用后数字、UUID、IP 等不同的同类消息只发送一次，
+                需要 cache_time 大于0
+            normalize_patterns: 自定义归一化规则，键为占位符名称，值为正则表达式，规则限制见 MessageNormalizer
         """
         self.webhook_url = webhook_url
         self.keyword = keyword
@@ -42,6 +49,10 @@ class LoguruFeishuSink:
         self.simple_log_levelno = simple_log_levelno
         self.simple_format = simple_format
         self.timeout = timeout
+        self.normalizer = (
+            MessageNormalizer(patterns=normalize_patterns)
+            if normalize_message and cache_time > 0 else None
+        )
         
         # 缓存相关
         self._cache: Dict[str, float] = {}
@@ -60,9 +71,14 @@ class LoguruFeishuSink:
         # 格式化消息内容
         formatted_content = self._format_message(message)
         
-        # 检查缓存
-        if self.cache_time > 0 and self._should_skip_by_cache(formatted_content):
-            return
+        # 检查缓存，启用归一化时按分组键去重
+        if self.cache_time > 0:
+            cache_content = (
+                self._get_group_key(message.record)
+                if self.normalizer else formatted_content
+            )
+            if self._should_skip_by_cache(cache_content):
+                return
             
         # 构造飞书消息格式
         feishu_message = self._build_feishu_message(formatted_content)
@@ -190,6 +206,14 @@ class LoguruFeishuSink:
         
         return {"title": title, "content": content_blocks}
     
+    def _get_group_key(self, record) -> str:
+        """根据归一化后的消息生成分组键，同一根因的日志得到相同的键"""
+        key = f"{record['level'].name}|{record['file'].path}:{record['line']}|"
+        key += self.normalizer.normalize(record["message"])
+        if record["exception"]:
+            key += f"|{record['exception'].type.__name__}"
+        return key
+    
     def _get_level_color(self, level: str) -> str:
         """根据日志级别获取对应颜色"""
         color_map = {
@@ -217,13 +241,13 @@ class LoguruFeishuSink:
             }
         }
     
-    def _should_skip_by_cache(self, formatted_content: Dict[str, Any]) -> bool:
+    def _should_skip_by_cache(self, content: Any) -> bool:
         """检查是否应该跳过发送（基于缓存）"""
         if self.cache_time <= 0:
             return False
             
-        # 将格式化内容转换为字符串生成哈希
-        content_str = json.dumps(formatted_content, ensure_ascii=False, sort_keys=True)
+        # 将格式化内容或分组键转换为字符串生成哈希
+        content_str = json.dumps(content, ensure_ascii=False, sort_keys=True)
         content_hash = hashlib.md5(content_str.encode('utf-8')).hexdigest()
         current_time = time.time()
         
@@ -271,6 +295,8 @@ def add_feishu_sink(
     filter_keys: Optional[List[str]] = None,
     simple_log_levelno: int = 30,
     simple_format: bool = True,
+    normalize_message: bool = False,
+    normalize_patterns: Optional[Dict[str, str]] = None,
     **kwargs
 ) -> int:
     """便捷函数：为 loguru logger 添加飞书 sink
@@ -283,6 +309,8 @@ def add_feishu_sink(
         filter_keys: 需要过滤的字段列表
         simple_log_levelno: 简化输出的日志级别阈值
         simple_format: 是否启用简化格式
+        normalize_message: 是否按归一化后的消息去重，需要 cache_time 大于0
+        normalize_patterns: 自定义归一化规则，键为占位符名称，值为正则表达式，规则限制见 MessageNormalizer
         **kwargs: 其他传递给 logger.add 的参数
         
     Returns:
@@ -301,7 +329,9 @@ def add_feishu_sink(
         cache_time=cache_time,
         filter_keys=filter_keys,
         simple_log_levelno=simple_log_levelno,
-        simple_format=simple_format
+        simple_format=simple_format,
+        normalize_message=normalize_message,
+        normalize_patterns=normalize_patterns
     )
     
     return logger.add(sink, level=level, **kwargs) 
\ No newline at end of file
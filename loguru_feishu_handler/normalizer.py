@@ -0,0 +1,111 @@
+import re
+import warnings
+from typing import Optional, Dict, Pattern
+
+
+# 内置的掩码规则，顺序即匹配优先级：UUID 先于十六进制，IP 先于普通数字
+DEFAULT_PATTERNS: Dict[str, str] = {
+    "UUID": r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b",
+    # IPv4（可带端口）或 IPv6（含 :: 缩写及内嵌 IPv4 形式）
+    "IP": r"\b(?:\d{1,3}\.){3}\d{1,3}(?::\d{1,5})?\b"
+          r"|(?<![\w:])(?=[0-9a-fA-F:]*::|(?:[0-9a-fA-F]{1,4}:){7})(?=[0-9a-fA-F:]*[0-9a-fA-F])"
+          r"(?:[0-9a-fA-F]{0,4}:){2,7}(?:\d{1,3}(?:\.\d{1,3}){3}|[0-9a-fA-F]{0,4})(?![\w:])",
+    "HEX": r"\b(?:0[xX][0-9a-fA-F]+|(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,})\b",
+    "NUM": r"(?<![\w.])[-+]?\d+(?:\.\d+)*",
+}
+
+# 合并时每条规则外层分组的名称前缀
+_GROUP_PREFIX = "__norm"
+
+# 数字分组引用：奇数个反斜杠后跟数字（\1），或条件分组 (?(1)...)
+_NUMBERED_GROUPREF = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(\d+\)")
+
+
+class MessageNormalizer:
+    """日志消息归一化器
+
+    将消息中的数字、UUID、十六进制 ID、IP 以及自定义模式替换为占位符，
+    使同一根因产生的消息得到相同的分组键，用于去重
+    """
+
+    def __init__(
+        self,
+        patterns: Optional[Dict[str, str]] = None,
+        use_default_patterns: bool = True
+    ):
+        """初始化归一化器
+
+        Args:
+            patterns: 自定义掩码规则，键为占位符名称，值为正则表达式，优先于内置规则匹配。
+                所有规则会合并为一个正则，因此不支持全局内联标志（如 ``(?i)``，请改用 ``(?i:...)``）
+                和数字反向引用（如 ``\\1``，请改用命名分组 ``(?P<name>...)`` 和 ``(?P=name)``），
+                分组名不能跨规则重复，也不能以 ``__norm`` 开头，规则不能匹配空字符串
+            use_default_patterns: 是否启用内置规则（数字、UUID、十六进制 ID、IP）
+        """
+        rules: Dict[str, str] = dict(patterns or {})
+        group_owners: Dict[str, str] = {}
+        for name, pattern in rules.items():
+            self._check_pattern(name, pattern)
+            # 合并后所有分组共享同一命名空间，分组名不能跨规则重复或占用内部前缀
+            for group in re.compile(pattern).groupindex:
+                if group.startswith(_GROUP_PREFIX):
+                    raise ValueError(f"归一化规则 {name} 的分组名 {group} 不能以 {_GROUP_PREFIX} 开头")
+                if group in group_owners:
+                    raise ValueError(
+                        f"归一化规则 {name} 的分组名 {group} 与规则 {group_owners[group]} 重复"
+                    )
+                group_owners[group] = name
+        if use_default_patterns:
+            for name, pattern in DEFAULT_PATTERNS.items():
+                rules.setdefault(name, pattern)
+
+        self._placeholders = [f"<{name}>" for name in rules]
+        self._regex: Optional[Pattern[str]] = None
+        if rules:
+            # 所有规则合并为一个正则，一次扫描完成替换
+            self._regex = re.compile(
+                "|".join(f"(?P<{_GROUP_PREFIX}{i}>{pattern})" for i, pattern in enumerate(rules.values()))
+            )
+
+    def __call__(self, message: str) -> str:
+        return self.normalize(message)
+
+    def normalize(self, message: str) -> str:
+        """返回归一化后的消息"""
+        if self._regex is None:
+            return message
+        return self._regex.sub(self._replace, message)
+
+    @staticmethod
+    def _check_pattern(name: str, pattern: str):
+        """检查自定义规则能否合并进统一的正则"""
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"归一化规则 {name} 不是合法的正则表达式: {e}") from e
+        
+        # 能匹配空串的规则会在每个字符间插入占位符
+        if re.match(pattern, ""):
+            raise ValueError(f"归一化规则 {name} 不能匹配空字符串")
+        
+        # 合并后分组编号会整体偏移，数字分组引用会静默指向其他分组
+        if _NUMBERED_GROUPREF.search(pattern):
+            raise ValueError(
+                f"归一化规则 {name} 无法与其他规则合并: 不支持数字分组引用，"
+                f"请使用 (?P<name>...) 命名分组和 (?P=name) 引用"
+            )
+        
+        # 按合并后的形式包装编译，提前暴露全局内联标志的问题
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", DeprecationWarning)
+                re.compile(f"(?P<{_GROUP_PREFIX}0>{pattern})")
+        except (re.error, DeprecationWarning) as e:
+            raise ValueError(
+                f"归一化规则 {name} 无法与其他规则合并: {e}，"
+                f"请使用 (?i:...) 形式的局部标志和 (?P<name>...) 命名分组"
+            ) from e
+
+    def _replace(self, match) -> str:
+        """将命中的片段替换为对应占位符"""
+        return self._placeholders[int(match.lastgroup[len(_GROUP_PREFIX):])]
@@ -10,6 +10,7 @@ from unittest.mock import Mock, patch
 from loguru import logger
 
 from loguru_feishu_handler.handler import LoguruFeishuSink, add_feishu_sink
+from loguru_feishu_handler.normalizer import MessageNormalizer
 
 
 class TestLoguruFeishuSink(unittest.TestCase):
@@ -191,6 +192,35 @@ class TestLoguruFeishuSink(unittest.TestCase):
         # 缓存过期后，应该不跳过
         self.assertFalse(sink._should_skip_by_cache(content1))
     
+    def test_cache_with_normalize_message(self):
+        """测试按归一化后的消息去重"""
+        sink = LoguruFeishuSink(self.webhook_url, cache_time=60, normalize_message=True)
+        
+        mock_level = Mock()
+        mock_level.name = "ERROR"
+        
+        def make_record(message):
+            return {
+                "level": mock_level,
+                "message": message,
+                "file": Mock(path="/test/file.py"),
+                "line": 25,
+                "exception": None
+            }
+        
+        key1 = sink._get_group_key(make_record("timeout after 3012ms for order 88121"))
+        key2 = sink._get_group_key(make_record("timeout after 2987ms for order 90022"))
+        key3 = sink._get_group_key(make_record("connection refused"))
+        
+        self.assertEqual(key1, key2)
+        self.assertFalse(sink._should_skip_by_cache(key1))
+        self.assertTrue(sink._should_skip_by_cache(key2))
+        self.assertFalse(sink._should_skip_by_cache(key3))
+        
+        # 未启用缓存时不构建归一化器
+        sink = LoguruFeishuSink(self.webhook_url, cache_time=0, normalize_message=True)
+        self.assertIsNone(sink.normalizer)
+    
     def test_build_feishu_message(self):
         """测试构造飞书消息格式"""
         sink = LoguruFeishuSink(self.webhook_url, keyword="告警")
@@ -277,6 +307,83 @@ class TestLoguruFeishuSink(unittest.TestCase):
         )
 
 
+class TestMessageNormalizer(unittest.TestCase):
+    """MessageNormalizer 测试类"""
+    
+    def test_normalize_default_patterns(self):
+        """测试内置掩码规则"""
+        normalizer = MessageNormalizer()
+        
+        self.assertEqual(
+            normalizer.normalize("timeout after 3012ms for order 88121"),
+            "timeout after <NUM>ms for order <NUM>"
+        )
+        self.assertEqual(
+            normalizer.normalize("task 123e4567-e89b-12d3-a456-426614174000 failed"),
+            "task <UUID> failed"
+        )
+        self.assertEqual(
+            normalizer.normalize("connect 10.0.0.12:6379 failed, trace 5f3a9c0b7e21"),
+            "connect <IP> failed, trace <HEX>"
+        )
+        self.assertEqual(normalizer.normalize("addr 0xdeadbeef"), "addr <HEX>")
+        self.assertEqual(
+            normalizer.normalize("connect 2001:db8::1 and fe80::a1b2:3c4d failed"),
+            "connect <IP> and <IP> failed"
+        )
+        self.assertEqual(
+            normalizer.normalize("peer 2001:0db8:0000:0000:0000:ff00:0042:8329 via ::ffff:192.0.2.1"),
+            "peer <IP> via <IP>"
+        )
+        self.assertEqual(normalizer.normalize("listen [::1]:8080"), "listen [<IP>]:<NUM>")
+        self.assertEqual(normalizer.normalize("std::vector at 10:30:25"), "std::vector at <NUM>:<NUM>:<NUM>")
+        self.assertEqual(normalizer.normalize("user_1 in v2 api"), "user_1 in v2 api")
+        self.assertEqual(
+            normalizer.normalize("user_42 calls v12 api with abc123 and item456"),
+            "user_42 calls v12 api with abc123 and item456"
+        )
+        self.assertEqual(normalizer.normalize("retry 3 times, cost 1.5s"), "retry <NUM> times, cost <NUM>s")
+        self.assertEqual(normalizer.normalize("upgrade 1.2.3 -> 1.2.4"), "upgrade <NUM> -> <NUM>")
+    
+    def test_normalize_custom_patterns(self):
+        """测试自定义掩码规则"""
+        normalizer = MessageNormalizer(patterns={"EMAIL": r"[\w.]+@[\w.]+"})
+        
+        self.assertEqual(
+            normalizer.normalize("send to a.b@test.com failed 3 times"),
+            "send to <EMAIL> failed <NUM> times"
+        )
+        
+        normalizer = MessageNormalizer(
+            patterns={"ORDER": r"ORD-\w+"}, use_default_patterns=False
+        )
+        self.assertEqual(normalizer.normalize("ORD-881 retry 3"), "<ORDER> retry 3")
+    
+    def test_normalize_invalid_patterns(self):
+        """测试无法合并的自定义规则"""
+        for pattern in [r"(?i)ord-\d+", r"(['\"])\w+\1", r"(x)(y)\2", r"(x)?(?(1)y|z)", r"ord-(", r"x*"]:
+            with self.assertRaises(ValueError) as ctx:
+                MessageNormalizer(patterns={"ORDER": pattern})
+            self.assertIn("ORDER", str(ctx.exception))
+        
+        normalizer = MessageNormalizer(
+            patterns={"ORDER": r"(?i:ord-\d+)", "QUOTED": r"(?P<q>['\"])\w+(?P=q)"}
+        )
+        self.assertEqual(normalizer.normalize("Ord-12 'abc'"), "<ORDER> <QUOTED>")
+        
+        with self.assertRaises(ValueError) as ctx:
+            MessageNormalizer(patterns={"A": r"(?P<q>')a(?P=q)", "B": r"(?P<q>\")b(?P=q)"})
+        self.assertIn("B", str(ctx.exception))
+        
+        with self.assertRaises(ValueError) as ctx:
+            MessageNormalizer(patterns={"A": r"(?P<__norm1>z)"})
+        self.assertIn("A", str(ctx.exception))
+        
+        # 转义的反斜杠后跟数字不是分组引用
+        normalizer = MessageNormalizer(patterns={"PATH": r"C:\\1\w*"}, use_default_patterns=False)
+        self.assertEqual(normalizer.normalize("open C:\\1abc"), "open <PATH>")
+
+
 class TestAddFeishuSink(unittest.TestCase):
     """add_feishu_sink 函数测试类"""
     
@@ -299,6 +406,28 @@ class TestAddFeishuSink(unittest.TestCase):
         
         # 清理
         logger.remove(sink_id)
+    
+    @patch('requests.post')
+    def test_add_feishu_sink_normalize_message(self, mock_post):
+        """测试归一化后同类消息只发送一次"""
+        logger.remove()
+        
+        for normalize_message, expected_calls in [(True, 1), (False, 2)]:
+            mock_post.reset_mock()
+            sink_id = add_feishu_sink(
+                webhook_url=self.webhook_url,
+                level="ERROR",
+                normalize_message=normalize_message
+            )
+            
+            for cost, order_id in [(3012, 88121), (2987, 90022)]:
+                logger.error(f"timeout after {cost}ms for order {order_id}")
+            
+            # 等待线程执行
+            time.sleep(0.1)
+            logger.remove(sink_id)
+            
+            self.assertEqual(mock_post.call_count, expected_calls)
 
 
 if __name__ == "__main__":